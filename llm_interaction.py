@@ -1,13 +1,37 @@
+import orjson
 import requests
-import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 LLM_API_URL = "http://localhost:1234/v1/chat/completions"
 
+# Shared session so every call reuses pooled keep-alive connections to the LLM server.
+SESSION = requests.Session()
+SESSION.headers.update({"Connection": "keep-alive"})
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=2,
+        read=0,  # never resend a generation POST after a read timeout
+        backoff_factor=0.3,
+        backoff_jitter=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["POST"]
+    )
+))
+
+# Shared worker pool so LLM calls reuse threads instead of starting a new one each time.
+# Unlike the old daemon threads, pool workers are joined at interpreter exit, so an
+# in-flight call can delay exit until the request timeout and retries run out.
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm")
+
 def extract_useful_info(text, callback=None):
     """
     Extract useful information from the given text using the LLM.
     If a callback is provided, it will be called with the result.
-    This function runs the API call in a separate thread.
+    This function runs the API call on the shared worker pool.
     """
     # System message to instruct the model to be concise
     system_message = {
@@ -28,9 +52,14 @@ def extract_useful_info(text, callback=None):
 
     def make_request():
         try:
-            response = requests.post(LLM_API_URL, json=data)
+            response = SESSION.post(
+                LLM_API_URL,
+                data=orjson.dumps(data),
+                headers={"Content-Type": "application/json"},
+                timeout=(3.05, 120)  # (connect, read) so a hung server can't pin a worker
+            )
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 useful_info = result.get("choices", [{}])[0].get("message", {}).get("content", "")
                 if callback:
                     callback(useful_info)
@@ -41,5 +70,4 @@ def extract_useful_info(text, callback=None):
             if callback:
                 callback(f"Error sending to LLM: {e}")
 
-    thread = threading.Thread(target=make_request, daemon=True)
-    thread.start()
+    EXECUTOR.submit(make_request)
@@ -1,14 +1,18 @@
 import os
-import json
-import queue
+import functools
+import importlib.util
+import orjson
+import asyncio
 import threading
 import time
-import requests
+import random
 import logging
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QLineEdit, QFrame, QScrollArea, QSpinBox
-from PyQt5.QtCore import QTimer
-from PyQt5.QtCore import Qt, QTimer as PyQtTimer
-from PyQt5.QtGui import QIcon
+import httpx
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QLineEdit, QFrame, QSpinBox, QTextEdit
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QTextCursor
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer
 
@@ -18,7 +22,31 @@ BASE_MODEL_DIR = "model"
 LOG_FILE = "log.txt"
 SAMPLERATE = 16000      # Default sample rate (Hz)
 BLOCKSIZE = 8000        # Default block size
-TIMEOUT = 0.1           # Timeout for queue get
+TIMEOUT = 0.1           # Idle wait when the audio ring buffer is empty
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None  # httpx needs h2 for HTTP/2
+RING_SIZE = 20          # Number of audio blocks held in the ring buffer
+BLOCKS_PER_DECODE = 2   # Audio blocks fed to the recognizer per AcceptWaveform call
+API_TEST_INTERVAL = 600 # Seconds between API endpoint tests
+MAX_API_BACKOFF = 3600  # Upper bound for the retest delay of a failing endpoint
+MAX_BATCH = 32          # Max utterances packed into one LLM request
+LLM_RETRIES = 2         # Retries for the LLM request on 502/503/504
+LLM_BACKOFF = 0.3       # Base delay (s) between LLM retries; doubled each retry, plus jitter
+BATCH_PROMPT = (
+    "Process each of these utterances and return a JSON object whose \"results\" "
+    "list holds one entry per utterance, in the same order:\n"
+)
+BATCH_RESPONSE_FORMAT = {  # LM Studio accepts json_schema (not json_object) structured output
+    "type": "json_schema",
+    "json_schema": {
+        "name": "batch_results",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"results": {"type": "array", "items": {"type": "string"}}},
+            "required": ["results"],
+        },
+    },
+}
 LLM_API_URL = "http://localhost:1234/v1/chat/completions"  # LLM endpoint URL
 
 # API endpoints to test independently.
@@ -56,7 +84,38 @@ logging.basicConfig(
     filemode='a'
 )
 
+@functools.lru_cache(maxsize=1)
+def _input_devices():
+    """Query PortAudio for input devices once; cleared by the Rescan button."""
+    return tuple(
+        f"{idx}: {dev['name']}"
+        for idx, dev in enumerate(sd.query_devices())
+        if dev['max_input_channels'] > 0
+    )
+
+@functools.lru_cache(maxsize=1)
+def _model_list():
+    """Scan the model folder once; returns None if it doesn't exist."""
+    if not os.path.isdir(BASE_MODEL_DIR):
+        return None
+    return tuple(
+        entry for entry in os.listdir(BASE_MODEL_DIR)
+        if os.path.isdir(os.path.join(BASE_MODEL_DIR, entry))
+    )
+
 class SpeechRecognitionGUI(QWidget):
+    # Emitted from the asyncio thread as a streamed LLM reply starts, grows and completes
+    # (or aborts part-way).
+    llm_stream_start_sig = pyqtSignal()
+    llm_token_sig = pyqtSignal(str)
+    llm_response_sig = pyqtSignal(list)
+    llm_abort_sig = pyqtSignal()
+    # Emitted from the asyncio thread with (endpoint index, success, error message).
+    api_status_sig = pyqtSignal(int, bool, str)
+    # Emitted from the audio thread with final and in-progress recognition text.
+    recognized_sig = pyqtSignal(str)
+    partial_sig = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Vosk Speech Recognition GUI")
@@ -72,32 +131,71 @@ class SpeechRecognitionGUI(QWidget):
 
         # New variable: dump interval for sending text to LLM (in seconds)
         self.dump_interval = 120
-        self.time_remaining = self.dump_interval  # seconds until next dump
-        self.timer_running = False
+        self.deadline = None  # time.monotonic() value of the next dump
+        self.dump_idle = False  # True while the timer waits for new speech
         self.timer_enabled = True  # Determines if the timer is active
 
         # Flags and threads
         self.listening = False
         self.audio_thread = None
 
-        # Queue for incoming audio data
-        self.audio_queue = queue.Queue(maxsize=20)
-        self.transcribed_text = ""  # Holds accumulated recognized text
+        # Single-producer/single-consumer ring buffer for incoming audio blocks.
+        # The audio callback only advances write_idx and the processing thread
+        # only advances read_idx, so neither side needs a lock.
+        self.ring = None
+        self.ring_frames = np.zeros(RING_SIZE, dtype=np.int64)
+        self.write_idx = 0
+        self.read_idx = 0
+        self.dropped = 0  # Blocks discarded because the ring was full (audio thread only)
+        self.pending_utterances = []  # Recognized utterances waiting for the next dump (GUI thread only)
 
         # Dictionary to hold API LED widget references keyed by endpoint index.
         self.api_widgets = {}
+        # Per-endpoint retest delay (doubled on failure) and loop time of the next test.
+        self.api_backoff = {index: API_TEST_INTERVAL for index in range(len(API_ENDPOINTS))}
+        self.api_next_probe = {index: 0.0 for index in range(len(API_ENDPOINTS))}
+
+        # Single asyncio loop (on its own thread) that drives all HTTP I/O.
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        # The transport retries failed connects; read timeouts bound a hung server.
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+                retries=2
+            ),
+            timeout=httpx.Timeout(120.0, connect=3.05)
+        )
+        self.llm_lock = None  # Created on the asyncio loop; serializes streamed replies
+        self.stream_start = 0  # Response area position where the current stream began
+        self.llm_stream_start_sig.connect(self.begin_llm_response)
+        self.llm_token_sig.connect(self.append_llm_token)
+        self.llm_response_sig.connect(self.finish_llm_response)
+        self.llm_abort_sig.connect(self.abort_llm_response)
+        self.api_status_sig.connect(self.update_api_status)
+        self.recognized_sig.connect(self.append_transcript)
 
         self.create_widgets()
         self.load_config()
-
-        # Start the timer updates for LLM dump if enabled
+        self.partial_sig.connect(self.partial_label.setText)
+
+        # dump_timer fires the LLM dump; tick_timer only refreshes the countdown label.
+        self.dump_timer = QTimer(self)
+        self.dump_timer.setSingleShot(True)
+        self.dump_timer.setTimerType(Qt.PreciseTimer)  # fire on the deadline the label counts down to
+        self.dump_timer.timeout.connect(self.dump_text_to_llm)
+        self.tick_timer = QTimer(self)
+        self.tick_timer.setInterval(1000)
+        self.tick_timer.timeout.connect(self.update_timer)
+        self.tick_timer.timeout.connect(self.update_dropped_label)
+
+        # Start the timer for LLM dump if enabled
         if self.timer_enabled:
-            self.timer_running = True
-            self.update_timer()
+            self.restart_dump_timer()
 
-        # Start API tests for each endpoint immediately.
-        for index, ep in enumerate(API_ENDPOINTS):
-            self.test_endpoint(index, ep)
+        # Start API tests for all endpoints immediately.
+        asyncio.run_coroutine_threadsafe(self.probe_all(), self.loop)
 
     def log(self, message):
         """Thread-safe logging to the log file, only for LLM responses."""
@@ -106,134 +204,85 @@ class SpeechRecognitionGUI(QWidget):
 
     def get_input_devices(self):
         """Returns a list of available input devices with index and name."""
-        devices = sd.query_devices()
-        input_devices = []
-        for idx, dev in enumerate(devices):
-            if dev['max_input_channels'] > 0:
-                input_devices.append(f"{idx}: {dev['name']}")
-        return input_devices
+        return list(_input_devices())
 
     def get_model_list(self):
         """Returns a list of subdirectories in the model folder."""
-        models = []
-        if not os.path.isdir(BASE_MODEL_DIR):
+        models = _model_list()
+        if models is None:
             self.log(f"Model directory '{BASE_MODEL_DIR}' not found.")
             QApplication.instance().quit()  # Correct way to exit in PyQt5
-        else:
-            for entry in os.listdir(BASE_MODEL_DIR):
-                full_path = os.path.join(BASE_MODEL_DIR, entry)
-                if os.path.isdir(full_path):
-                    models.append(entry)
-            if not models:
-                self.log(f"No model subdirectories found in '{BASE_MODEL_DIR}'.")
-                QApplication.instance().quit()  # Exit if no models are found
-        return models
-
-
+            return []
+        if not models:
+            self.log(f"No model subdirectories found in '{BASE_MODEL_DIR}'.")
+            QApplication.instance().quit()  # Exit if no models are found
+        return list(models)
+
+    def rescan_devices(self):
+        """Re-enumerate input devices and models, keeping the current selections."""
+        # The audio thread keeps its stream open for a moment after listening is cleared,
+        # so wait for the thread itself to finish before tearing PortAudio down.
+        if self.audio_thread is not None and self.audio_thread.is_alive():
+            self.log("Stop listening before rescanning input devices.")
+            return
+        # PortAudio fixes its device list at initialization; restart it to see new devices.
+        # sounddevice has no public API for this, so its private _terminate/_initialize
+        # helpers are used deliberately.
+        sd._terminate()
+        sd._initialize()
+        _input_devices.cache_clear()
+        _model_list.cache_clear()
+        for combo, items in ((self.mic_combo, self.get_input_devices()),
+                             (self.model_combo, self.get_model_list())):
+            current = combo.currentText()
+            combo.clear()
+            combo.addItems(items)
+            combo.setCurrentText(current)
+        self.log("Rescanned input devices and models.")
 
     def manual_dump(self):
         """Manually trigger the dump to the LLM and reset the timer."""
         self.dump_text_to_llm()
-        if self.timer_enabled:
-            self.timer_running = True
-            self.time_remaining = self.dump_interval
-
-    def create_widgets(self):
-        """Create the GUI layout and widgets."""
-        layout = QVBoxLayout()
-
-        # Top frame: device and model selection, plus start/stop, manual dump, and timer toggle buttons.
-        top_frame = QHBoxLayout()
-        layout.addLayout(top_frame)
-
-        # Microphone selection
-        top_frame.addWidget(QLabel("Select Microphone:"))
-        self.mic_combo = QComboBox()
-        self.mic_combo.addItems(self.get_input_devices())
-        top_frame.addWidget(self.mic_combo)
-
-        # Model selection
-        top_frame.addWidget(QLabel("Select Model:"))
-        self.model_combo = QComboBox()
-        self.model_combo.addItems(self.get_model_list())
-        top_frame.addWidget(self.model_combo)
-
-        # Buttons: Start/Stop Listening and Manual Dump
-        self.start_stop_btn = QPushButton("Start Listening")
-        self.start_stop_btn.clicked.connect(self.toggle_listening)
-        top_frame.addWidget(self.start_stop_btn)
-
-        self.manual_dump_btn = QPushButton("Manually Dump")
-        self.manual_dump_btn.clicked.connect(self.manual_dump)
-        top_frame.addWidget(self.manual_dump_btn)
-
-        # Timer toggle button
-        self.timer_toggle_btn = QPushButton("Disable Timer")
-        self.timer_toggle_btn.clicked.connect(self.toggle_timer)
-        top_frame.addWidget(self.timer_toggle_btn)
-
-        # Timer display
-        self.timer_label = QLabel(f"Next dump in: {self.time_remaining} seconds")
-        layout.addWidget(self.timer_label)
-
-        # API Status Section
-        api_frame = QVBoxLayout()
-        layout.addLayout(api_frame)
-        for index, ep in enumerate(API_ENDPOINTS):
-            row_layout = QHBoxLayout()
-            api_frame.addLayout(row_layout)
-            row_layout.addWidget(QLabel(f"{ep.get('name')}:"))
-
-            status_label = QLabel("Checking...")
-            row_layout.addWidget(status_label)
-            self.api_widgets[index] = status_label
-
-        # Transcribed text area
-        self.transcribed_text_area = QScrollArea()
-        layout.addWidget(self.transcribed_text_area)
-
-        # LLM Response area
-        self.llm_response_area = QScrollArea()
-        layout.addWidget(self.llm_response_area)
 
-        self.setLayout(layout)
-        
-        
-    def test_endpoint(self, index, ep):
-        """Test a single API endpoint in a separate thread and update its status label."""
-        def run_test():
-            success = True
-            error_msg = ""
-            method = ep.get("method")
-            url = ep.get("url")
-
-            try:
-                if method == "GET":
-                    response = requests.get(url, timeout=5)
-                elif method == "POST":
-                    response = requests.post(url, json=ep.get("json", {}), timeout=5)
-                else:
-                    success = False
-                    error_msg = f"Unsupported method: {method}"
-                    response = None
-
-                if response is not None and response.status_code != 200:
-                    success = False
-                    error_msg = f"Status {response.status_code}"
-            except Exception as e:
-                success = False
-                error_msg = str(e)
+    async def probe_endpoint(self, ep):
+        """Send a single test request to an API endpoint."""
+        method = ep.get("method")
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported method: {method}")
+        return await self.client.request(method, ep.get("url"), json=ep.get("json"), timeout=5)
+
+    async def probe_all(self):
+        """Test all due API endpoints concurrently and reschedule for the next one due.
+
+        Each endpoint is retested after API_TEST_INTERVAL seconds; a failing endpoint
+        doubles its delay on every failure, up to MAX_API_BACKOFF.
+        """
+        now = self.loop.time()
+        due = [index for index, next_probe in self.api_next_probe.items() if next_probe <= now]
+        results = await asyncio.gather(
+            *[self.probe_endpoint(API_ENDPOINTS[index]) for index in due],
+            return_exceptions=True
+        )
+        for index, result in zip(due, results):
+            if isinstance(result, Exception):
+                success, error_msg = False, str(result)
+            elif result.status_code != 200:
+                success, error_msg = False, f"Status {result.status_code}"
+            else:
+                success, error_msg = True, ""
+            self.api_status_sig.emit(index, success, error_msg)
 
-            # Update the status label on the main thread
-            self.update_api_status(index, success, error_msg)
-            
-            # Schedule the next test for this endpoint in 10 minutes (600,000 ms)
-            PyQtTimer.singleShot(600000, lambda: self.test_endpoint(index, ep))
+            if success:
+                self.api_backoff[index] = API_TEST_INTERVAL
+            else:
+                self.api_backoff[index] = min(self.api_backoff[index] * 2, MAX_API_BACKOFF)
+            self.api_next_probe[index] = self.loop.time() + self.api_backoff[index]
 
-        threading.Thread(target=run_test, daemon=True).start()
+        delay = max(0.0, min(self.api_next_probe.values()) - self.loop.time())
+        self.loop.call_later(delay, lambda: self.loop.create_task(self.probe_all()))
 
     def update_api_status(self, index, success, error_msg):
-        """Update the API status label for a specific endpoint."""
+        """Update the API status label for a specific endpoint (GUI thread)."""
         if index in self.api_widgets:
             status_label = self.api_widgets[index]
             if success:
@@ -246,22 +295,28 @@ class SpeechRecognitionGUI(QWidget):
         """Load saved configuration from a file if it exists."""
         if os.path.exists(CONFIG_FILE):
             try:
-                with open(CONFIG_FILE, "r") as f:
-                    config = json.load(f)
+                with open(CONFIG_FILE, "rb") as f:
+                    config = orjson.loads(f.read())
                 saved_mic = config.get("microphone", "")
-                saved_model = config.get("models", "")
-                if saved_mic in self.mic_combo:
-                    self.selected_mic = saved_mic
-                if saved_model in self.model_combo:
-                    self.selected_model = saved_model
+                saved_model = config.get("model", "")
+                if saved_mic and self.mic_combo.findText(saved_mic) >= 0:
+                    self.mic_combo.setCurrentText(saved_mic)
+                if saved_model and self.model_combo.findText(saved_model) >= 0:
+                    self.model_combo.setCurrentText(saved_model)
                 self.log("Configuration loaded.")
             except Exception as e:
                 self.log(f"Error loading config: {e}")
-        else:
-            if self.mic_combo:
-                self.selected_mic = self.mic_combo[0]
-            if self.model_combo:
-                self.selected_model = self.model_combo[0]
+        # Fall back to whatever the combo boxes show (their first item by default)
+        self.selected_mic = self.mic_combo.currentText() or None
+        self.selected_model = self.model_combo.currentText() or None
+
+    def select_mic(self, text):
+        """Track the microphone chosen in the combo box."""
+        self.selected_mic = text or None
+
+    def select_model(self, text):
+        """Track the model chosen in the combo box."""
+        self.selected_model = text or None
 
     def save_config(self):
         """Save the current configuration to a file."""
@@ -270,8 +325,8 @@ class SpeechRecognitionGUI(QWidget):
             "model": self.selected_model
         }
         try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(config, f, indent=4)
+            with open(CONFIG_FILE, "wb") as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
             self.log("Configuration saved.")
         except Exception as e:
             self.log(f"Error saving config: {e}")
@@ -295,8 +350,14 @@ class SpeechRecognitionGUI(QWidget):
         if status:
             self.log(f"Audio input status: {status}")
         try:
-            if not self.audio_queue.full():
-                self.audio_queue.put(bytes(indata))
+            write_idx = self.write_idx
+            if write_idx - self.read_idx < RING_SIZE:
+                slot = write_idx % RING_SIZE
+                np.copyto(self.ring[slot, :frames], np.frombuffer(indata, dtype=np.int16))
+                self.ring_frames[slot] = frames
+                self.write_idx = write_idx + 1
+            else:
+                self.dropped += 1
         except Exception as e:
             self.log(f"Error in audio callback: {e}")
 
@@ -327,6 +388,11 @@ class SpeechRecognitionGUI(QWidget):
             self.listening = False
             return
 
+        self.ring = np.zeros((RING_SIZE, self.block_size), dtype=np.int16)
+        self.write_idx = 0
+        self.read_idx = 0
+        self.dropped = 0
+
         try:
             with sd.RawInputStream(
                 samplerate=self.sample_rate,
@@ -338,85 +404,242 @@ class SpeechRecognitionGUI(QWidget):
             ):
                 self.log("Microphone initialized. Listening for speech...")
                 while self.listening:
-                    try:
-                        data = self.audio_queue.get(timeout=self.timeout)
-                    except queue.Empty:
+                    read_idx = self.read_idx
+                    if self.write_idx - read_idx < BLOCKS_PER_DECODE:
+                        time.sleep(self.timeout)
                         continue
 
+                    # Decode several blocks per call to cut Python/C crossings; the
+                    # copy is taken before read_idx frees the slots for the callback.
+                    data = self.ring_data(read_idx, read_idx + BLOCKS_PER_DECODE)
+                    self.read_idx = read_idx + BLOCKS_PER_DECODE
+
+                    # Vosk calls into Kaldi through CFFI, which releases the GIL for the
+                    # duration of the C call, so decoding doesn't stall the GUI thread.
                     if recognizer.AcceptWaveform(data):
-                        result_json = recognizer.Result()
-                        result_dict = json.loads(result_json)
-                        text = result_dict.get("text", "")
-                        if text:
-                            self.transcribed_text += text + "\n"
-                            self.transcribed_text_area.append(f"Recognized: {text}\n")
+                        self.emit_recognized(recognizer.Result())
+                    else:
+                        partial = orjson.loads(recognizer.PartialResult()).get("partial", "")
+                        self.partial_sig.emit(partial)
+
+            # The stream is closed; decode blocks left short of BLOCKS_PER_DECODE
+            # and flush the utterance that was still in progress.
+            if self.write_idx > self.read_idx:
+                if recognizer.AcceptWaveform(self.ring_data(self.read_idx, self.write_idx)):
+                    self.emit_recognized(recognizer.Result())
+                self.read_idx = self.write_idx
+            self.emit_recognized(recognizer.FinalResult())
         except Exception as e:
             self.log(f"Audio processing error: {e}")
         finally:
+            self.partial_sig.emit("")
             self.log("Audio processing stopped.")
             self.listening = False
             self.start_stop_btn.setText("Start Listening")
 
-    def request_llm_in_thread(self, data):
-        """Runs the LLM API call in a separate thread to avoid blocking the UI."""
-        def make_request():
+    def ring_data(self, start, stop):
+        """Copy ring blocks start..stop-1 into one contiguous buffer for the recognizer."""
+        slots = [idx % RING_SIZE for idx in range(start, stop)]
+        return np.concatenate(
+            [self.ring[slot, :self.ring_frames[slot]] for slot in slots]
+        ).tobytes()
+
+    def emit_recognized(self, result_json):
+        """Send the text of a final recognizer result to the GUI thread (audio thread)."""
+        text = orjson.loads(result_json).get("text", "")
+        self.partial_sig.emit("")
+        if text:
+            self.recognized_sig.emit(text)
+
+    def request_llm(self, data):
+        """Schedules the LLM API call on the asyncio loop to avoid blocking the UI."""
+        future = asyncio.run_coroutine_threadsafe(self.stream_llm(data), self.loop)
+        future.add_done_callback(self.handle_llm_response)
+
+    async def stream_llm(self, data):
+        """Streams the LLM reply, retrying with jittered backoff on 502/503/504."""
+        if self.llm_lock is None:
+            self.llm_lock = asyncio.Lock()
+        async with self.llm_lock:
+            for attempt in range(LLM_RETRIES + 1):
+                if attempt:
+                    await asyncio.sleep(LLM_BACKOFF * 2 ** (attempt - 1) + random.uniform(0, LLM_BACKOFF))
+                async with self.client.stream(
+                    "POST", LLM_API_URL,
+                    content=orjson.dumps({**data, "stream": True}),
+                    headers={"Content-Type": "application/json"}
+                ) as response:
+                    if response.status_code in (502, 503, 504) and attempt < LLM_RETRIES:
+                        continue
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode(errors="replace")
+                        self.log(f"LLM API returned status {response.status_code}: {body}")
+                        return None
+                    self.llm_stream_start_sig.emit()
+                    completed = False
+                    try:
+                        content = await self.read_llm_stream(response)
+                        completed = True
+                        return content
+                    finally:
+                        if not completed:
+                            self.llm_abort_sig.emit()
+
+    async def read_llm_stream(self, response):
+        """Reads SSE chunks, forwarding each token to the GUI thread as it arrives."""
+        content = ""
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            payload = line[len("data:"):].strip()
+            if payload == "[DONE]":
+                break
             try:
-                response = requests.post(LLM_API_URL, json=data)
-                if response.status_code == 200:
-                    result = response.json()
-                    useful_info = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                    self.log(f"Useful information extracted:\n{useful_info}")
-                    self.llm_response_area.append(f"LLM Response: {useful_info}\n")
-                else:
-                    self.log("Error in LLM API request.")
-            except Exception as e:
-                self.log(f"Error sending to LLM: {e}")
+                chunk = orjson.loads(payload)
+            except ValueError:
+                continue  # Skip a malformed chunk rather than dropping the whole reply
+            token = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+            if token:
+                content += token
+                self.llm_token_sig.emit(token)
+        return content
+
+    def handle_llm_response(self, future):
+        """Splits the completed LLM reply into results and hands them to the GUI thread."""
+        try:
+            useful_info = future.result()
+            if useful_info is not None:
+                self.log(f"Useful information extracted:\n{useful_info}")
+                self.llm_response_sig.emit(self.parse_batch_results(useful_info))
+            else:
+                self.log("Error in LLM API request.")
+        except Exception as e:
+            self.log(f"Error sending to LLM: {e}")
 
-        thread = threading.Thread(target=make_request, daemon=True)
-        thread.start()
+    def parse_batch_results(self, content):
+        """Split a batched LLM reply back into one result per utterance."""
+        try:
+            parsed = orjson.loads(content)
+        except ValueError:
+            return [content]
+        if isinstance(parsed, dict):
+            parsed = parsed.get("results", parsed)
+        if not isinstance(parsed, list):
+            return [content]
+        return [item if isinstance(item, str) else orjson.dumps(item).decode() for item in parsed]
+
+    def append_transcript(self, text):
+        """Queue a recognized utterance for the next dump and show it (GUI thread)."""
+        self.pending_utterances.append(text)
+        if len(self.pending_utterances) == 1:
+            self.resume_dump_timer()
+        self.transcribed_text_area.append(f"Recognized: {text}\n")
+        if len(self.pending_utterances) == MAX_BATCH:
+            self.manual_dump()
+
+    def begin_llm_response(self):
+        """Start a new streamed reply at the end of the response area (GUI thread)."""
+        self.llm_response_area.moveCursor(QTextCursor.End)
+        self.stream_start = self.llm_response_area.textCursor().position()
+        self.llm_response_area.append("LLM Response: ")
+
+    def append_llm_token(self, token):
+        """Append a streamed token to the current reply (GUI thread)."""
+        self.llm_response_area.moveCursor(QTextCursor.End)
+        self.llm_response_area.insertPlainText(token)
+
+    def remove_streamed_reply(self):
+        """Delete the raw streamed text of the current reply (GUI thread)."""
+        cursor = self.llm_response_area.textCursor()
+        cursor.setPosition(self.stream_start)
+        cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+
+    def finish_llm_response(self, results):
+        """Replace the raw streamed reply with one line per result (GUI thread)."""
+        self.remove_streamed_reply()
+        for text in results:
+            self.llm_response_area.append(f"LLM Response: {text}\n")
+
+    def abort_llm_response(self):
+        """Replace a reply whose stream failed part-way with an error line (GUI thread)."""
+        self.remove_streamed_reply()
+        self.llm_response_area.append("LLM Response: Error: reply was interrupted (see log.txt)\n")
 
     def dump_text_to_llm(self):
-        """Dumps the accumulated transcribed text to the LLM for processing."""
-        if self.transcribed_text.strip():
+        """Dumps the pending utterances to the LLM as batched prompts.
+
+        With nothing pending, the timer goes idle until new speech is recognized.
+        """
+        pending, self.pending_utterances = self.pending_utterances, []
+        if not pending:
+            self.dump_idle = True
+            self.dump_timer.stop()
+            if self.timer_enabled:
+                self.timer_label.setText("Next dump: idle (waiting for speech)")
+            return
+        for start in range(0, len(pending), MAX_BATCH):
+            batch = pending[start:start + MAX_BATCH]
             data = {
-                "messages": [{"role": "user", "content": self.transcribed_text}],
+                "messages": [{"role": "user", "content": BATCH_PROMPT + orjson.dumps(batch).decode()}],
+                "response_format": BATCH_RESPONSE_FORMAT,
             }
-            self.request_llm_in_thread(data)
-            self.transcribed_text = ""  # Clear text after dump
-        self.time_remaining = self.dump_interval  # Reset the timer based on the current interval
+            self.request_llm(data)
         if self.timer_enabled:
-            self.timer_running = True
-            self.update_timer()
+            self.restart_dump_timer()
+
+    def restart_dump_timer(self):
+        """Restart the countdown to the next automatic LLM dump."""
+        self.dump_idle = False
+        self.deadline = time.monotonic() + self.dump_interval
+        self.dump_timer.start(self.dump_interval * 1000)
+        self.update_timer()
 
     def update_timer(self):
-        """Updates the countdown timer for the next LLM dump."""
-        if self.timer_running and self.timer_enabled:
-            self.time_remaining -= 1
-            self.timer_label.setText(f"Next dump in: {self.time_remaining} seconds")
-            if self.time_remaining <= 0:
-                self.dump_text_to_llm()
-            else:
-                PyQtTimer.singleShot(1000, self.update_timer)
+        """Updates the countdown label for the next LLM dump."""
+        if self.timer_enabled and not self.dump_idle:
+            remaining = max(0, int(self.deadline - time.monotonic()))
+            self.timer_label.setText(f"Next dump in: {remaining} seconds")
+
+    def resume_dump_timer(self):
+        """Restart the idle countdown once new speech has been recognized."""
+        if self.dump_idle and self.timer_enabled:
+            self.restart_dump_timer()
+
+    def update_dropped_label(self):
+        """Shows how many audio blocks were dropped because processing fell behind."""
+        self.dropped_label.setText(f"Dropped audio blocks: {self.dropped}")
+
+    def showEvent(self, event):
+        """Resume countdown and dropped-block label updates while the window is visible."""
+        super().showEvent(event)
+        self.update_timer()
+        self.update_dropped_label()
+        self.tick_timer.start()
+
+    def hideEvent(self, event):
+        """Pause countdown and dropped-block label updates while the window is hidden."""
+        super().hideEvent(event)
+        self.tick_timer.stop()
 
     def toggle_timer(self):
         """Toggle automatic LLM dump timer on/off."""
         if self.timer_enabled:
             # Disable the timer
             self.timer_enabled = False
-            self.timer_running = False
+            self.dump_timer.stop()
             self.timer_toggle_btn.setText("Enable Timer")
             self.timer_label.setText("Timer disabled")
             self.log("LLM dump timer disabled.")
         else:
             # Enable the timer and reset the countdown
             self.timer_enabled = True
-            self.time_remaining = self.dump_interval
-            self.timer_running = True
             self.timer_toggle_btn.setText("Disable Timer")
-            self.update_timer()
+            self.restart_dump_timer()
             self.log("LLM dump timer enabled.")
 
     def create_widgets(self):
+        """Create the GUI layout and widgets."""
         layout = QVBoxLayout()
 
         # Top frame: device and model selection, plus start/stop, manual dump, and timer toggle buttons.
@@ -427,14 +650,21 @@ class SpeechRecognitionGUI(QWidget):
         top_frame.addWidget(QLabel("Select Microphone:"))
         self.mic_combo = QComboBox()
         self.mic_combo.addItems(self.get_input_devices())
+        self.mic_combo.currentTextChanged.connect(self.select_mic)
         top_frame.addWidget(self.mic_combo)
 
         # Model selection
         top_frame.addWidget(QLabel("Select Model:"))
         self.model_combo = QComboBox()
         self.model_combo.addItems(self.get_model_list())
+        self.model_combo.currentTextChanged.connect(self.select_model)
         top_frame.addWidget(self.model_combo)
 
+        # Re-enumerate devices and models (both are cached after the first scan)
+        self.rescan_btn = QPushButton("Rescan", self)
+        self.rescan_btn.clicked.connect(self.rescan_devices)
+        top_frame.addWidget(self.rescan_btn)
+
         # Buttons: Start/Stop Listening and Manual Dump
         self.start_stop_btn = QPushButton("Start Listening", self)
         self.start_stop_btn.clicked.connect(self.toggle_listening)
@@ -450,9 +680,13 @@ class SpeechRecognitionGUI(QWidget):
         top_frame.addWidget(self.timer_toggle_btn)
 
         # Fine-tuning settings
-        self.timer_label = QLabel(f"Next dump in: {self.time_remaining} seconds")
+        self.timer_label = QLabel(f"Next dump in: {self.dump_interval} seconds")
         layout.addWidget(self.timer_label)
 
+        # Audio underrun indicator, refreshed every second
+        self.dropped_label = QLabel("Dropped audio blocks: 0")
+        layout.addWidget(self.dropped_label)
+
         # API LED indicators
         api_frame = QVBoxLayout()
         layout.addLayout(api_frame)
@@ -466,11 +700,17 @@ class SpeechRecognitionGUI(QWidget):
             self.api_widgets[index] = status_label
 
         # Transcribed text area
-        self.transcribed_text_area = QScrollArea()
+        self.transcribed_text_area = QTextEdit()
+        self.transcribed_text_area.setReadOnly(True)
         layout.addWidget(self.transcribed_text_area)
 
+        # In-progress (partial) recognition of the current utterance
+        self.partial_label = QLabel("")
+        layout.addWidget(self.partial_label)
+
         # LLM Response area
-        self.llm_response_area = QScrollArea()
+        self.llm_response_area = QTextEdit()
+        self.llm_response_area.setReadOnly(True)
         layout.addWidget(self.llm_response_area)
 
         self.setLayout(layout)